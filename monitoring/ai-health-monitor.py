@@ -16,14 +16,39 @@ import time
 import statistics
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 import numpy as np
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 import requests
-import subprocess
 import os
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps  # returns bytes
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+try:
+    from isotree import IsolationForest as IsoTreeIsolationForest
+except ImportError:  # pragma: no cover - isotree is optional
+    IsoTreeIsolationForest = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    def njit(*args, **kwargs):
+        """No-op fallback when numba is not installed"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,9 +60,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger('AutoHealX-AI-Monitor')
 
-@dataclass
+# Per-service collection timeout and circuit-breaker tuning
+COLLECT_TIMEOUT = float(os.getenv('COLLECT_TIMEOUT', '5'))
+FAIL_THRESHOLD = int(os.getenv('FAIL_THRESHOLD', '3'))
+COOLDOWN_CYCLES = int(os.getenv('COOLDOWN_CYCLES', '5'))
+
+# Retrain the anomaly detectors every N predictions instead of every cycle
+RETRAIN_EVERY = int(os.getenv('RETRAIN_EVERY', '10'))
+
+# TTL (seconds) per metric for the in-process actuator cache; only
+# effectively-constant gauges belong here - everything else (counters,
+# rates, live gauges) is always fetched fresh
+METRIC_TTLS = {
+    'jvm.memory.max': 300.0,   # effectively constant for a JVM's lifetime
+}
+
+# Minimum seconds between repeated healing actions for the same
+# (service, alert type) pair
+ACTION_COOLDOWN_S = float(os.getenv('ACTION_COOLDOWN_S', '300'))
+
+# Notification log written by the background writer task
+NOTIFICATIONS_FILE = '/tmp/autohealx-notifications.json'
+NOTIF_BATCH_MAX = 50
+
+# Anomaly detection backend: 'iforest' (sklearn), 'isotree' (C++ forest)
+# or 'zscore' (streaming per-feature z-score, no model fitting at all)
+ANOMALY_BACKEND = os.getenv('ANOMALY_BACKEND', 'iforest')
+ZSCORE_K = float(os.getenv('ZSCORE_K', '3.0'))
+
+# Sliding window of feature rows kept per service for anomaly detection
+HISTORY_SIZE = 100
+N_FEATURES = 5
+MIN_TRAIN_SAMPLES = 10
+
+@njit(cache=True)
+def _check_thresholds_kernel(values, thresholds):
+    """Return exceedance and critical masks for (n_services, n_metrics) values"""
+    exceed = values > thresholds
+    critical = values > thresholds * 1.5
+    return exceed, critical
+
+@dataclass(frozen=True)
 class ServiceMetrics:
     """Data class for service metrics"""
+    # Manual __slots__ (rather than slots=True) keeps Python 3.8 support
+    __slots__ = ('service_name', 'timestamp', 'response_time', 'error_rate',
+                 'cpu_usage', 'memory_usage', 'request_count', 'is_healthy')
     service_name: str
     timestamp: datetime
     response_time: float
@@ -57,9 +125,11 @@ class ServiceMetrics:
             self.request_count
         ]
 
-@dataclass
+@dataclass(frozen=True)
 class HealthAlert:
     """Data class for health alerts"""
+    __slots__ = ('service_name', 'alert_type', 'severity', 'message',
+                 'timestamp', 'metrics', 'prediction_confidence')
     service_name: str
     alert_type: str
     severity: str
@@ -81,11 +151,21 @@ class AIHealthMonitor:
         
         self.prometheus_url = 'http://localhost:9090'
         self.grafana_url = 'http://localhost:3000'
+
+        # When enabled, one batched PromQL query per cycle replaces the
+        # per-service actuator polling
+        self.use_prometheus = os.getenv(
+            'USE_PROMETHEUS', 'false').lower() in ('1', 'true', 'yes')
         
         # ML models for anomaly detection
         self.anomaly_detectors = {}
         self.scalers = {}
         self.metrics_history = {}
+        self._hist_len = {}
+        self._hist_pos = {}
+        self._train_counter = {}
+        self._model_fitted = {}
+        self._welford = {}
         
         # Thresholds for alerts
         self.thresholds = {
@@ -94,139 +174,340 @@ class AIHealthMonitor:
             'cpu_usage': 80.0,     # percentage
             'memory_usage': 85.0,  # percentage
         }
+
+        # Vectorized view of the thresholds for the numeric check kernel
+        self._thr_vec = np.array(
+            list(self.thresholds.values()), dtype=np.float32)
         
+        # Shared HTTP session (created lazily, reused across all cycles)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Thread pool for CPU-bound sklearn fit/predict, keeping the event
+        # loop free while the four services score concurrently
+        self._pool = ThreadPoolExecutor(
+            max_workers=len(self.services),
+            thread_name_prefix='anomaly')
+
+        # TTL cache of actuator metric values: (base_url, metric) -> (value, expiry)
+        self._cache: Dict[Tuple[str, str], Tuple[Optional[float], float]] = {}
+
+        # Notifications are queued here and flushed by _notif_writer through
+        # an O_APPEND descriptor held open for the monitor's lifetime
+        self._notif_queue: asyncio.Queue = asyncio.Queue()
+        self._notif_fd: Optional[int] = None
+
+        # Debounce repeated healing actions: (service, alert_type) -> monotonic time
+        self._last_action: Dict[Tuple[str, str], float] = {}
+
+        # Circuit breaker: consecutive failures and remaining skip cycles
+        self._fail_counts: Dict[str, int] = {name: 0 for name in self.services}
+        self._skip_cycles: Dict[str, int] = {name: 0 for name in self.services}
+
         # Initialize ML models
         self._initialize_ml_models()
-        
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared aiohttp session on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32,
+                    limit_per_host=8,
+                    keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=5)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session and worker pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            self._session = None
+        self._pool.shutdown(wait=False)
+        if self._notif_fd is not None:
+            os.close(self._notif_fd)
+            self._notif_fd = None
+
     def _initialize_ml_models(self):
         """Initialize ML models for each service"""
+        self._backend = ANOMALY_BACKEND
+        if self._backend == 'isotree' and IsoTreeIsolationForest is None:
+            logger.warning("isotree not installed, falling back to sklearn IsolationForest")
+            self._backend = 'iforest'
+
         for service in self.services.keys():
-            self.anomaly_detectors[service] = IsolationForest(
-                contamination=0.1,
-                random_state=42
-            )
+            if self._backend == 'isotree':
+                self.anomaly_detectors[service] = IsoTreeIsolationForest(
+                    ntrees=25,
+                    nthreads=-1
+                )
+            else:
+                self.anomaly_detectors[service] = IsolationForest(
+                    contamination=0.1,
+                    random_state=42,
+                    n_jobs=-1
+                )
+            # Welford running stats (count, mean, M2) for the zscore backend
+            self._welford[service] = [
+                0,
+                np.zeros(N_FEATURES, dtype=np.float64),
+                np.zeros(N_FEATURES, dtype=np.float64),
+            ]
             self.scalers[service] = StandardScaler()
-            self.metrics_history[service] = []
+            # Preallocated ring buffer of feature rows (SoA layout keeps the
+            # matrix contiguous for sklearn without per-cycle repacking)
+            self.metrics_history[service] = np.zeros(
+                (HISTORY_SIZE, N_FEATURES), dtype=np.float32)
+            self._hist_len[service] = 0
+            self._hist_pos[service] = 0
+            self._train_counter[service] = 0
+            self._model_fitted[service] = False
+
+        logger.debug(f"Feature matrices initialized with dtype "
+                     f"{next(iter(self.metrics_history.values())).dtype}")
     
     async def collect_service_metrics(self, service_name: str, base_url: str) -> Optional[ServiceMetrics]:
         """Collect metrics from a service"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Health check
-                health_url = f"{base_url}/actuator/health"
-                async with session.get(health_url, timeout=5) as response:
-                    is_healthy = response.status == 200
-                    health_data = await response.json() if is_healthy else {}
-                
-                # Metrics
-                metrics_url = f"{base_url}/actuator/metrics"
-                async with session.get(metrics_url, timeout=5) as response:
-                    if response.status != 200:
-                        return None
-                    
-                    metrics_data = await response.json()
-                    
-                    # Extract key metrics
-                    response_time = await self._get_metric_value(session, base_url, 'http.server.requests')
-                    error_rate = await self._calculate_error_rate(session, base_url)
-                    cpu_usage = await self._get_metric_value(session, base_url, 'process.cpu.usage') * 100
-                    memory_usage = await self._get_memory_usage(session, base_url)
-                    request_count = await self._get_metric_value(session, base_url, 'http.server.requests', tags='count')
-                    
-                    return ServiceMetrics(
-                        service_name=service_name,
-                        timestamp=datetime.now(),
-                        response_time=response_time or 0.0,
-                        error_rate=error_rate or 0.0,
-                        cpu_usage=cpu_usage or 0.0,
-                        memory_usage=memory_usage or 0.0,
-                        request_count=int(request_count or 0),
-                        is_healthy=is_healthy
-                    )
-                    
+            session = self._ensure_session()
+
+            # Health check
+            health_url = f"{base_url}/actuator/health"
+            async with session.get(health_url) as response:
+                is_healthy = response.status == 200
+                health_data = _json_loads(await response.read()) if is_healthy else {}
+
+            # Metrics
+            metrics_url = f"{base_url}/actuator/metrics"
+            async with session.get(metrics_url) as response:
+                if response.status != 200:
+                    return None
+
+                metrics_data = _json_loads(await response.read())
+
+            # Fetch all metric endpoints concurrently instead of one
+            # round-trip at a time
+            values, request_count = await asyncio.gather(
+                self._fetch_many(base_url, [
+                    'http.server.requests',
+                    'http.server.requests.4xx',
+                    'http.server.requests.5xx',
+                    'process.cpu.usage',
+                    'jvm.memory.used',
+                    'jvm.memory.max',
+                ]),
+                self._get_metric_value(base_url, 'http.server.requests', tags='count')
+            )
+
+            response_time = values.get('http.server.requests')
+            error_rate = self._calculate_error_rate(values)
+            cpu_usage = (values.get('process.cpu.usage') or 0.0) * 100
+            memory_usage = self._get_memory_usage(values)
+
+            return ServiceMetrics(
+                service_name=service_name,
+                timestamp=datetime.now(),
+                response_time=response_time or 0.0,
+                error_rate=error_rate or 0.0,
+                cpu_usage=cpu_usage or 0.0,
+                memory_usage=memory_usage or 0.0,
+                request_count=int(request_count or 0),
+                is_healthy=is_healthy
+            )
+
         except Exception as e:
             logger.error(f"Failed to collect metrics for {service_name}: {e}")
             return None
     
-    async def _get_metric_value(self, session: aiohttp.ClientSession, base_url: str, 
-                               metric_name: str, tags: str = None) -> Optional[float]:
+    async def _get_metric_value(self, base_url: str, metric_name: str,
+                               tags: str = None) -> Optional[float]:
         """Get specific metric value from actuator endpoint"""
+        # Serve slow-moving gauges from the TTL cache to avoid re-querying
+        # values that cannot have changed within the cycle
+        ttl = METRIC_TTLS.get(metric_name, 0.0)
+        cache_key = (base_url, f"{metric_name}:{tags}" if tags else metric_name)
+        if ttl > 0:
+            cached = self._cache.get(cache_key)
+            if cached is not None and time.monotonic() < cached[1]:
+                return cached[0]
+
         try:
             url = f"{base_url}/actuator/metrics/{metric_name}"
-            async with session.get(url, timeout=5) as response:
+            async with self._ensure_session().get(url) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    measurements = data.get('measurements', [])
-                    if measurements:
-                        return measurements[0].get('value', 0.0)
+                    raw = await response.read()
+                    if raw:
+                        # Pluck the first measurement directly; the payload's
+                        # availableTags block is never used
+                        try:
+                            value = _json_loads(raw)['measurements'][0]['value']
+                        except (KeyError, IndexError):
+                            return None
+                        if ttl > 0:
+                            self._cache[cache_key] = (value, time.monotonic() + ttl)
+                        return value
         except Exception as e:
             logger.debug(f"Failed to get metric {metric_name}: {e}")
         return None
     
-    async def _calculate_error_rate(self, session: aiohttp.ClientSession, base_url: str) -> float:
-        """Calculate error rate from HTTP metrics"""
+    async def _fetch_many(self, base_url: str,
+                          metric_names: List[str]) -> Dict[str, Optional[float]]:
+        """Fetch several actuator metrics concurrently in one gather"""
+        results = await asyncio.gather(
+            *[self._get_metric_value(base_url, name) for name in metric_names]
+        )
+        return dict(zip(metric_names, results))
+
+    def _calculate_error_rate(self, values: Dict[str, Optional[float]]) -> float:
+        """Calculate error rate from pre-fetched HTTP metrics"""
         try:
-            total_requests = await self._get_metric_value(session, base_url, 'http.server.requests')
+            total_requests = values.get('http.server.requests')
             error_requests = 0
-            
+
             # This is a simplified calculation - in reality, you'd query Prometheus
             # for more accurate error rate calculations
             for status in ['4xx', '5xx']:
-                errors = await self._get_metric_value(session, base_url, f'http.server.requests.{status}')
+                errors = values.get(f'http.server.requests.{status}')
                 if errors:
                     error_requests += errors
-            
+
             if total_requests and total_requests > 0:
                 return error_requests / total_requests
             return 0.0
-            
+
         except Exception:
             return 0.0
-    
-    async def _get_memory_usage(self, session: aiohttp.ClientSession, base_url: str) -> float:
-        """Calculate memory usage percentage"""
+
+    def _get_memory_usage(self, values: Dict[str, Optional[float]]) -> float:
+        """Calculate memory usage percentage from pre-fetched JVM metrics"""
         try:
-            used = await self._get_metric_value(session, base_url, 'jvm.memory.used')
-            max_memory = await self._get_metric_value(session, base_url, 'jvm.memory.max')
-            
+            used = values.get('jvm.memory.used')
+            max_memory = values.get('jvm.memory.max')
+
             if used and max_memory and max_memory > 0:
                 return (used / max_memory) * 100
             return 0.0
-            
+
         except Exception:
             return 0.0
     
+    # One instant query per field, so a whole cycle costs a handful of
+    # requests regardless of service count. Micrometer tags application
+    # metrics with 'application' (management.metrics.tags in the services'
+    # application.yml); scrape-level 'up' only carries 'job', whose names in
+    # prometheus.yml match the service names. Each entry is (label, query).
+    _PROM_QUERIES = {
+        'response_time': ('application',
+                          'histogram_quantile(0.95, sum by (application, le) '
+                          '(rate(http_server_requests_seconds_bucket[1m])))'),
+        'error_rate': ('application',
+                       'sum by (application) (rate(http_server_requests_seconds_count'
+                       '{status=~"4..|5.."}[1m])) / '
+                       'sum by (application) (rate(http_server_requests_seconds_count[1m]))'),
+        'cpu_usage': ('application', 'avg by (application) (process_cpu_usage) * 100'),
+        'memory_usage': ('application',
+                         'sum by (application) (jvm_memory_used_bytes) / '
+                         'sum by (application) (jvm_memory_max_bytes > 0) * 100'),
+        'request_count': ('application',
+                          'sum by (application) (increase(http_server_requests_seconds_count[1m]))'),
+        'up': ('job', 'max by (job) (up)'),
+    }
+
+    async def _prom_query(self, query: str) -> List[dict]:
+        """Run a PromQL instant query and return its result vector"""
+        try:
+            url = f"{self.prometheus_url}/api/v1/query"
+            async with self._ensure_session().get(url, params={'query': query}) as response:
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    if data.get('status') == 'success':
+                        return data['data'].get('result', [])
+        except Exception as e:
+            logger.debug(f"Prometheus query failed: {e}")
+        return []
+
+    async def collect_metrics_from_prometheus(self) -> Dict[str, ServiceMetrics]:
+        """Collect metrics for all services with batched PromQL queries"""
+        results = await asyncio.gather(
+            *[self._prom_query(query) for _, query in self._PROM_QUERIES.values()]
+        )
+
+        per_service: Dict[str, Dict[str, float]] = {}
+        for (field, (label, _)), result in zip(self._PROM_QUERIES.items(), results):
+            for sample in result:
+                service = sample.get('metric', {}).get(label)
+                if service not in self.services:
+                    continue
+                try:
+                    per_service.setdefault(service, {})[field] = float(sample['value'][1])
+                except (KeyError, IndexError, ValueError):
+                    continue
+
+        now = datetime.now()
+        return {
+            service: ServiceMetrics(
+                service_name=service,
+                timestamp=now,
+                response_time=values.get('response_time', 0.0),
+                error_rate=values.get('error_rate', 0.0),
+                cpu_usage=values.get('cpu_usage', 0.0),
+                memory_usage=values.get('memory_usage', 0.0),
+                request_count=int(values.get('request_count', 0.0)),
+                is_healthy=values.get('up', 0.0) == 1.0
+            )
+            for service, values in per_service.items()
+        }
+
     def predict_anomaly(self, service_name: str, metrics: ServiceMetrics) -> Tuple[bool, float]:
         """Use ML model to predict if metrics indicate an anomaly"""
         try:
-            # Add to history
-            self.metrics_history[service_name].append(metrics)
-            
-            # Keep only last 100 data points
-            if len(self.metrics_history[service_name]) > 100:
-                self.metrics_history[service_name] = self.metrics_history[service_name][-100:]
-            
-            # Need at least 10 data points to train
-            if len(self.metrics_history[service_name]) < 10:
+            # Write the new feature row into the ring buffer
+            history = self.metrics_history[service_name]
+            pos = self._hist_pos[service_name]
+            history[pos, 0] = metrics.response_time
+            history[pos, 1] = metrics.error_rate
+            history[pos, 2] = metrics.cpu_usage
+            history[pos, 3] = metrics.memory_usage
+            history[pos, 4] = metrics.request_count
+            self._hist_pos[service_name] = (pos + 1) % HISTORY_SIZE
+            self._hist_len[service_name] = min(
+                self._hist_len[service_name] + 1, HISTORY_SIZE)
+
+            # The streaming backend needs no window fitting at all
+            if self._backend == 'zscore':
+                return self._predict_zscore(service_name, history[pos])
+
+            # Need enough data points to train
+            if self._hist_len[service_name] < MIN_TRAIN_SAMPLES:
                 return False, 0.0
-            
-            # Prepare training data
-            features = [m.to_features() for m in self.metrics_history[service_name]]
-            X = np.array(features)
-            
-            # Scale features
-            X_scaled = self.scalers[service_name].fit_transform(X)
-            
-            # Train model
-            self.anomaly_detectors[service_name].fit(X_scaled)
-            
-            # Predict on current metrics
-            current_features = np.array([metrics.to_features()])
-            current_scaled = self.scalers[service_name].transform(current_features)
-            
+
+            # Retrain only periodically; reuse the cached model in between
+            retrain = (not self._model_fitted[service_name]
+                       or self._train_counter[service_name] % RETRAIN_EVERY == 0)
+            self._train_counter[service_name] += 1
+
+            if retrain:
+                # Ring order is irrelevant to IsolationForest, so the filled
+                # slice can be used as-is
+                X = history[:self._hist_len[service_name]]
+
+                # Scale features and train model
+                X_scaled = self.scalers[service_name].fit_transform(X)
+                self.anomaly_detectors[service_name].fit(X_scaled)
+                self._model_fitted[service_name] = True
+
+            # Predict on the row just written
+            current_scaled = self.scalers[service_name].transform(history[pos:pos + 1])
+
+            if self._backend == 'isotree':
+                # isotree scores are ~[0, 1] with higher = more anomalous
+                score = float(self.anomaly_detectors[service_name].predict(current_scaled)[0])
+                return score > 0.5, score
+
             prediction = self.anomaly_detectors[service_name].predict(current_scaled)[0]
             score = self.anomaly_detectors[service_name].score_samples(current_scaled)[0]
-            
+
             # Convert score to confidence (higher negative score = more anomalous)
             confidence = max(0, min(1, (score + 0.5) * 2))
             
@@ -236,43 +517,89 @@ class AIHealthMonitor:
         except Exception as e:
             logger.error(f"Anomaly prediction failed for {service_name}: {e}")
             return False, 0.0
-    
+
+    def _predict_zscore(self, service_name: str, row: np.ndarray) -> Tuple[bool, float]:
+        """Streaming z-score anomaly check using Welford running stats"""
+        state = self._welford[service_name]
+        state[0] += 1
+        n, mean, m2 = state
+        delta = row - mean
+        mean += delta / n
+        m2 += delta * (row - mean)
+
+        if n < MIN_TRAIN_SAMPLES:
+            return False, 0.0
+
+        sigma = np.sqrt(m2 / n)
+        sigma = np.where(sigma > 0, sigma, 1.0)
+        z = float(np.max(np.abs((row - mean) / sigma)))
+
+        is_anomaly = z > ZSCORE_K
+        confidence = max(0.0, min(1.0, z / (2 * ZSCORE_K)))
+        return is_anomaly, confidence
+
+    _THRESHOLD_CHECKS = [
+        ('response_time', 'HIGH_RESPONSE_TIME'),
+        ('error_rate', 'HIGH_ERROR_RATE'),
+        ('cpu_usage', 'HIGH_CPU_USAGE'),
+        ('memory_usage', 'HIGH_MEMORY_USAGE'),
+    ]
+
     def check_thresholds(self, metrics: ServiceMetrics) -> List[HealthAlert]:
-        """Check if metrics exceed predefined thresholds"""
+        """Check if one service's metrics exceed predefined thresholds"""
+        return self.check_thresholds_batch([metrics])
+
+    def check_thresholds_batch(self, metrics_list: List[ServiceMetrics]) -> List[HealthAlert]:
+        """Vectorized threshold check across any number of services"""
+        if not metrics_list:
+            return []
+
+        values = np.array([
+            [m.response_time, m.error_rate, m.cpu_usage, m.memory_usage]
+            for m in metrics_list
+        ], dtype=np.float32)
+
+        # One C-level comparison produces the full exceedance matrix;
+        # Python only builds alerts for the (rare) nonzero entries
+        exceed, critical = _check_thresholds_kernel(values, self._thr_vec)
+
         alerts = []
-        
-        checks = [
-            ('response_time', metrics.response_time, 'HIGH_RESPONSE_TIME'),
-            ('error_rate', metrics.error_rate, 'HIGH_ERROR_RATE'),
-            ('cpu_usage', metrics.cpu_usage, 'HIGH_CPU_USAGE'),
-            ('memory_usage', metrics.memory_usage, 'HIGH_MEMORY_USAGE'),
-        ]
-        
-        for metric_name, value, alert_type in checks:
-            threshold = self.thresholds[metric_name]
-            if value > threshold:
-                severity = 'CRITICAL' if value > threshold * 1.5 else 'WARNING'
-                message = f"{metric_name} is {value:.2f}, exceeding threshold of {threshold}"
-                
-                alerts.append(HealthAlert(
-                    service_name=metrics.service_name,
-                    alert_type=alert_type,
-                    severity=severity,
-                    message=message,
-                    timestamp=datetime.now(),
-                    metrics=metrics,
-                    prediction_confidence=1.0
-                ))
-        
+        for row, col in np.argwhere(exceed):
+            metrics = metrics_list[row]
+            metric_name, alert_type = self._THRESHOLD_CHECKS[col]
+            severity = 'CRITICAL' if critical[row, col] else 'WARNING'
+            message = (f"{metric_name} is {values[row, col]:.2f}, "
+                       f"exceeding threshold of {self.thresholds[metric_name]}")
+
+            alerts.append(HealthAlert(
+                service_name=metrics.service_name,
+                alert_type=alert_type,
+                severity=severity,
+                message=message,
+                # Reuse the collection timestamp instead of re-reading the clock
+                timestamp=metrics.timestamp,
+                metrics=metrics,
+                prediction_confidence=1.0
+            ))
+
         return alerts
     
     async def trigger_self_healing(self, alert: HealthAlert):
         """Trigger automated remediation based on alert type"""
         service_name = alert.service_name
         alert_type = alert.alert_type
-        
+
+        # Debounce: the same condition fires again on every cycle until the
+        # remediation takes effect, so don't re-trigger during the cooldown
+        key = (service_name, alert_type)
+        elapsed = time.monotonic() - self._last_action.get(key, float('-inf'))
+        if elapsed < ACTION_COOLDOWN_S:
+            logger.info(f"Skipping self-healing for {service_name}: {alert_type} "
+                        f"(in cooldown for {ACTION_COOLDOWN_S - elapsed:.0f}s more)")
+            return
+
         logger.info(f"Triggering self-healing for {service_name}: {alert_type}")
-        
+
         try:
             if alert_type == 'HIGH_MEMORY_USAGE':
                 await self._restart_service(service_name)
@@ -284,7 +611,10 @@ class AIHealthMonitor:
                 await self._scale_service(service_name, scale_up=True)
             else:
                 logger.warning(f"No remediation action defined for {alert_type}")
-                
+                return
+
+            self._last_action[key] = time.monotonic()
+
         except Exception as e:
             logger.error(f"Self-healing action failed for {service_name}: {e}")
     
@@ -292,15 +622,20 @@ class AIHealthMonitor:
         """Restart a service container"""
         try:
             container_name = f"autohealx-{service_name}"
-            cmd = f"docker restart {container_name}"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            
-            if result.returncode == 0:
+            # Async subprocess so the restart doesn't block the event loop
+            proc = await asyncio.create_subprocess_exec(
+                'docker', 'restart', container_name,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await proc.communicate()
+
+            if proc.returncode == 0:
                 logger.info(f"Successfully restarted {service_name}")
                 await self._send_notification(f"Service {service_name} restarted due to high memory usage")
             else:
-                logger.error(f"Failed to restart {service_name}: {result.stderr}")
-                
+                logger.error(f"Failed to restart {service_name}: {stderr.decode().strip()}")
+
         except Exception as e:
             logger.error(f"Error restarting {service_name}: {e}")
     
@@ -331,80 +666,160 @@ class AIHealthMonitor:
     async def _send_notification(self, message: str):
         """Send notification (simulated - could be Slack, email, etc.)"""
         logger.info(f"NOTIFICATION: {message}")
-        
+
         # In a real system, you would send to Slack, email, PagerDuty, etc.
+        # Epoch seconds avoid a datetime allocation + isoformat per record
         notification_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': time.time(),
             'message': message,
             'source': 'AutoHealX-AI-Monitor'
         }
-        
-        # Write to file for demo purposes
-        with open('/tmp/autohealx-notifications.json', 'a') as f:
-            f.write(json.dumps(notification_data) + '\n')
+
+        # Queue for the background writer instead of blocking the loop on
+        # file I/O here
+        self._notif_queue.put_nowait(_json_dumps(notification_data))
+
+    async def _notif_writer(self):
+        """Drain queued notifications and append them to the log in batches"""
+        if self._notif_fd is None:
+            self._notif_fd = os.open(
+                NOTIFICATIONS_FILE,
+                os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                0o644)
+
+        while True:
+            batch = [await self._notif_queue.get()]
+            while len(batch) < NOTIF_BATCH_MAX:
+                try:
+                    batch.append(self._notif_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                # One append-mode write per batch; atomic on POSIX for
+                # writes this small, with no open/close churn
+                os.write(self._notif_fd, b'\n'.join(batch) + b'\n')
+            except Exception as e:
+                logger.error(f"Failed to write notifications: {e}")
     
+    async def _monitor_one(self, service_name: str, base_url: str):
+        """Collect metrics, evaluate alerts and heal a single service"""
+        # Circuit breaker: skip services that kept failing recently
+        if self._skip_cycles[service_name] > 0:
+            self._skip_cycles[service_name] -= 1
+            logger.info(f"Skipping {service_name}, circuit open for "
+                        f"{self._skip_cycles[service_name] + 1} more cycle(s)")
+            return
+
+        # Collect metrics with a hard per-service deadline
+        try:
+            metrics = await asyncio.wait_for(
+                self.collect_service_metrics(service_name, base_url),
+                timeout=COLLECT_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Metric collection for {service_name} timed out "
+                           f"after {COLLECT_TIMEOUT}s")
+            metrics = None
+
+        if not metrics:
+            self._fail_counts[service_name] += 1
+            if self._fail_counts[service_name] >= FAIL_THRESHOLD:
+                self._skip_cycles[service_name] = COOLDOWN_CYCLES
+                self._fail_counts[service_name] = 0
+                logger.warning(f"Circuit opened for {service_name}, skipping "
+                               f"next {COOLDOWN_CYCLES} cycles")
+            logger.warning(f"Could not collect metrics for {service_name}")
+            return
+
+        self._fail_counts[service_name] = 0
+        await self._evaluate_metrics(service_name, metrics)
+
+    async def _evaluate_metrics(self, service_name: str, metrics: ServiceMetrics,
+                                threshold_alerts: Optional[List[HealthAlert]] = None):
+        """Run threshold checks, anomaly detection and healing on metrics"""
+        logger.info(f"Collected metrics for {service_name}: "
+                  f"RT={metrics.response_time:.2f}s, "
+                  f"ER={metrics.error_rate:.2%}, "
+                  f"CPU={metrics.cpu_usage:.1f}%, "
+                  f"MEM={metrics.memory_usage:.1f}%")
+
+        # Check thresholds unless the caller already did so in batch
+        if threshold_alerts is None:
+            threshold_alerts = self.check_thresholds(metrics)
+
+        # Check for anomalies using ML, off the event loop
+        is_anomaly, confidence = await asyncio.get_running_loop().run_in_executor(
+            self._pool, self.predict_anomaly, service_name, metrics)
+
+        if is_anomaly:
+            anomaly_alert = HealthAlert(
+                service_name=service_name,
+                alert_type='ANOMALY_DETECTED',
+                severity='WARNING',
+                message=f"ML model detected anomaly with confidence {confidence:.2%}",
+                timestamp=metrics.timestamp,
+                metrics=metrics,
+                prediction_confidence=confidence
+            )
+            threshold_alerts.append(anomaly_alert)
+
+        # Process alerts
+        for alert in threshold_alerts:
+            logger.warning(f"ALERT: {alert.service_name} - {alert.alert_type} - {alert.message}")
+
+            # Trigger self-healing for critical alerts
+            if alert.severity == 'CRITICAL':
+                await self.trigger_self_healing(alert)
+
     async def run_monitoring_cycle(self):
         """Run one complete monitoring cycle"""
         logger.info("Starting monitoring cycle...")
-        
-        for service_name, base_url in self.services.items():
-            try:
-                # Collect metrics
-                metrics = await self.collect_service_metrics(service_name, base_url)
-                
-                if not metrics:
-                    logger.warning(f"Could not collect metrics for {service_name}")
-                    continue
-                
-                logger.info(f"Collected metrics for {service_name}: "
-                          f"RT={metrics.response_time:.2f}s, "
-                          f"ER={metrics.error_rate:.2%}, "
-                          f"CPU={metrics.cpu_usage:.1f}%, "
-                          f"MEM={metrics.memory_usage:.1f}%")
-                
-                # Check thresholds
-                threshold_alerts = self.check_thresholds(metrics)
-                
-                # Check for anomalies using ML
-                is_anomaly, confidence = self.predict_anomaly(service_name, metrics)
-                
-                if is_anomaly:
-                    anomaly_alert = HealthAlert(
-                        service_name=service_name,
-                        alert_type='ANOMALY_DETECTED',
-                        severity='WARNING',
-                        message=f"ML model detected anomaly with confidence {confidence:.2%}",
-                        timestamp=datetime.now(),
-                        metrics=metrics,
-                        prediction_confidence=confidence
-                    )
-                    threshold_alerts.append(anomaly_alert)
-                
-                # Process alerts
-                for alert in threshold_alerts:
-                    logger.warning(f"ALERT: {alert.service_name} - {alert.alert_type} - {alert.message}")
-                    
-                    # Trigger self-healing for critical alerts
-                    if alert.severity == 'CRITICAL':
-                        await self.trigger_self_healing(alert)
-                
-            except Exception as e:
-                logger.error(f"Error monitoring {service_name}: {e}")
+
+        if self.use_prometheus:
+            # One batched PromQL round instead of per-service actuator hops
+            metrics_by_service = await self.collect_metrics_from_prometheus()
+            if not metrics_by_service:
+                logger.warning("No metrics returned from Prometheus")
+            # Threshold-check every service in one vectorized pass
+            batch_alerts: Dict[str, List[HealthAlert]] = {name: [] for name in metrics_by_service}
+            for alert in self.check_thresholds_batch(list(metrics_by_service.values())):
+                batch_alerts[alert.service_name].append(alert)
+            names = list(metrics_by_service.keys())
+            tasks = [self._evaluate_metrics(name, metrics, batch_alerts[name])
+                     for name, metrics in metrics_by_service.items()]
+        else:
+            # Monitor all services concurrently; cycle time is bounded by the
+            # slowest service instead of the sum of all of them
+            names = list(self.services.keys())
+            tasks = [self._monitor_one(service_name, base_url)
+                     for service_name, base_url in self.services.items()]
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for service_name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error monitoring {service_name}: {result}")
     
     async def run_continuous_monitoring(self, interval: int = 30):
         """Run continuous monitoring with specified interval"""
         logger.info(f"Starting continuous monitoring with {interval}s interval...")
         
-        while True:
-            try:
-                await self.run_monitoring_cycle()
-                await asyncio.sleep(interval)
-            except KeyboardInterrupt:
-                logger.info("Monitoring stopped by user")
-                break
-            except Exception as e:
-                logger.error(f"Unexpected error in monitoring loop: {e}")
-                await asyncio.sleep(interval)
+        writer_task = asyncio.create_task(self._notif_writer())
+        try:
+            while True:
+                try:
+                    await self.run_monitoring_cycle()
+                    await asyncio.sleep(interval)
+                except KeyboardInterrupt:
+                    logger.info("Monitoring stopped by user")
+                    break
+                except Exception as e:
+                    logger.error(f"Unexpected error in monitoring loop: {e}")
+                    await asyncio.sleep(interval)
+        finally:
+            writer_task.cancel()
+            await self.close()
 
 async def main():
     """Main function"""
@@ -420,4 +835,10 @@ async def main():
     await monitor.run_continuous_monitoring(interval=30)
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        logger.info("uvloop not installed, using default event loop")
     asyncio.run(main())
\ No newline at end of file